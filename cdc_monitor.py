@@ -7,25 +7,51 @@ PostgreSQL数据库监控工具 - Textual版本
 
 import argparse
 import asyncio
+import json
 import re
 import signal
 import sys
+import time
+from collections import deque
 from configparser import ConfigParser
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from functools import lru_cache
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
 import aiomysql
 import asyncpg
-from rich.text import Text
 from textual.app import App, ComposeResult
 from textual.containers import Container, Vertical
+from textual.coordinate import Coordinate
 from textual.timer import Timer
 from textual.widgets import DataTable, Footer, Header, Static
 
+# 预编译表名映射用的正则，避免每次调用重新解析模式
+# （re模块内部缓存较小，表数量多时按字符串查找缓存也有开销）
+_RE_NUM9_YEAR = re.compile(r'_\d{9}_\d{4}$')
+_RE_UUID_UNDERSCORE = re.compile(
+    r'_[0-9a-fA-F]{8}_[0-9a-fA-F]{4}_[0-9a-fA-F]{4}_[0-9a-fA-F]{4}_[0-9a-fA-F]{12}$')
+_RE_UUID_HYPHEN = re.compile(
+    r'_[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+_RE_UUID_UNDERSCORE_YEAR = re.compile(
+    r'_[0-9a-fA-F]{8}_[0-9a-fA-F]{4}_[0-9a-fA-F]{4}_[0-9a-fA-F]{4}_[0-9a-fA-F]{12}_\d{4}$')
+_RE_SEP = re.compile(r'[-_]')
 
-@dataclass
+# UUID预检用的十六进制字符集合
+_HEXSET = frozenset('0123456789abcdefABCDEF')
+
+# 精确COUNT批量查询的每批表数量（UNION ALL合并，控制单条语句规模）
+_COUNT_BATCH_SIZE = 50
+
+# PG精确COUNT的单表语句超时（秒）：单表慢查询不能拖垮整轮刷新，超时降级为规划器估计值；
+# 批量UNION ALL语句按批内表数等比放大该超时
+_PG_COUNT_TIMEOUT_SECS = 2
+_PG_COUNT_TIMEOUT = f'{_PG_COUNT_TIMEOUT_SECS}s'
+
+
+@dataclass(slots=True)
 class DatabaseConfig:
     """数据库配置"""
     host: str
@@ -35,14 +61,14 @@ class DatabaseConfig:
     password: str
 
 
-@dataclass
+@dataclass(slots=True)
 class MySQLConfig(DatabaseConfig):
     """MySQL配置"""
     databases: List[str] = field(default_factory=list)
-    ignored_prefixes: List[str] = field(default_factory=list)
+    ignored_prefixes: tuple = ()  # 已去空白的前缀元组，可直接传给str.startswith
 
 
-@dataclass
+@dataclass(slots=True)
 class TableInfo:
     """表信息"""
     schema_name: str
@@ -51,37 +77,98 @@ class TableInfo:
     mysql_rows: int = 0
     previous_pg_rows: int = 0
     mysql_source_tables: List[str] = field(default_factory=list)
-    last_updated: datetime = field(default_factory=datetime.now)  # 改为datetime对象
-    mysql_last_updated: datetime = field(default_factory=datetime.now)  # MySQL数据最后更新时间
+    last_updated: float = field(default_factory=time.time)  # PG最后更新时间（epoch秒，整数运算比datetime相减快）
+    mysql_last_updated: float = field(default_factory=time.time)  # MySQL数据最后更新时间（epoch秒）
     is_first_query: bool = True
     mysql_updating: bool = False  # MySQL是否正在更新中
     pg_updating: bool = False  # PostgreSQL是否正在更新中
     pg_is_estimated: bool = False  # PG数据是否为估计值
     mysql_is_estimated: bool = False  # MySQL数据是否为估计值
 
-    @property
-    def change(self) -> int:
-        """PostgreSQL记录数变化"""
-        return 0 if self.is_first_query else self.pg_rows - self.previous_pg_rows
-
-    @property
-    def data_diff(self) -> int:
-        """数据差异"""
-        if self.pg_rows == -1 or self.mysql_rows == -1:
-            return 0  # 错误状态时差异为0，避免统计计算错误
-        return self.pg_rows - self.mysql_rows
-
-    @property
-    def is_consistent(self) -> bool:
-        """数据是否一致"""
+    # 派生字段：渲染路径每帧多次读取，改为在计数写入时物化，避免每次属性分发重算
+    change: int = 0  # PostgreSQL记录数变化
+    data_diff: int = 0  # 数据差异
+    is_consistent: bool = True  # 数据是否一致
+    full_name: str = ""  # 完整表名
+    schema_display: str = ""  # 渲染好的schema名单元格（不随数据变化）
+    table_display: str = ""  # 渲染好的表名单元格（不随数据变化）
+
+    def __post_init__(self):
+        self.full_name = f"{self.schema_name}.{self.target_table_name}"
+        # 名称类单元格与数据无关，构造时渲染一次即可
+        schema_text = self.schema_name[:12] + '...' if len(self.schema_name) > 15 else self.schema_name
+        table_text = (self.target_table_name[:35] + '...'
+                      if len(self.target_table_name) > 38 else self.target_table_name)
+        self.schema_display = f"[bold medium_purple3]{schema_text}[/]"  # Schema用中紫色
+        self.table_display = f"[bold dodger_blue2]{table_text}[/]"  # 表名用道奇蓝色
+        self.refresh_derived()
+
+    def refresh_derived(self):
+        """重新计算依赖记录数的派生字段（计数写入路径负责调用）"""
+        self.change = 0 if self.is_first_query else self.pg_rows - self.previous_pg_rows
         if self.pg_rows == -1 or self.mysql_rows == -1:
-            return False  # 错误状态视为不一致
-        return self.pg_rows == self.mysql_rows
-
-    @property
-    def full_name(self) -> str:
-        """完整表名"""
-        return f"{self.schema_name}.{self.target_table_name}"
+            # 错误状态：差异为0避免统计计算错误，一致性视为不一致
+            self.data_diff = 0
+            self.is_consistent = False
+        else:
+            self.data_diff = self.pg_rows - self.mysql_rows
+            self.is_consistent = self.pg_rows == self.mysql_rows
+
+
+@lru_cache(maxsize=4096)
+def _relative_time_str(total_seconds: int) -> str:
+    """按总秒数格式化相对时间；同一秒龄的行共享同一字符串，免去重复格式化"""
+    if total_seconds < 0:
+        return "刚刚"
+    elif total_seconds < 60:
+        return f"{total_seconds}秒前"
+    elif total_seconds < 3600:  # 小于1小时
+        minutes = total_seconds // 60
+        return f"{minutes}分钟前"
+    elif total_seconds < 86400:  # 小于1天
+        hours = total_seconds // 3600
+        return f"{hours}小时前"
+    elif total_seconds < 2592000:  # 小于30天
+        days = total_seconds // 86400
+        return f"{days}天前"
+    elif total_seconds < 31536000:  # 小于1年
+        months = total_seconds // 2592000
+        return f"{months}个月前"
+    else:
+        years = total_seconds // 31536000
+        return f"{years}年前"
+
+
+# 按数值符号(-1/0/1)索引的markup模板，渲染行时免去逐分支判断
+_DIFF_MARKUP = {
+    -1: "[bold orange3]{:+,}[/]",  # 负数用橙色（PG落后）
+    0: "[dim white]0[/]",  # 零用暗白色（与变化量一致）
+    1: "[bold bright_green]{:+,}[/]",  # 正数用亮绿色（PG领先）
+}
+_CHANGE_MARKUP = {
+    -1: "[bold orange3]{:,} ⬇[/]",  # 减少用橙色
+    0: "[dim white]0[/]",  # 无变化只显示0，与数据差异保持一致
+    1: "[bold spring_green3]+{:,} ⬆[/]",  # 增加用春绿色
+}
+
+
+@lru_cache(maxsize=512)
+def _styled_time_str(time_str: str) -> str:
+    """给相对时间字符串套上颜色（时间桶字符串数量有限，结果可安全缓存）"""
+    if "年前" in time_str or "个月前" in time_str:
+        return f"[bold orange1]{time_str}[/]"  # 很久没更新用橙色
+    elif "天前" in time_str:
+        return f"[bold yellow3]{time_str}[/]"  # 几天前用深黄色
+    elif "小时前" in time_str:
+        return f"[bright_cyan]{time_str}[/]"  # 几小时前用亮青色
+    else:
+        return f"[dim bright_black]{time_str}[/]"  # 最近更新用暗色
+
+
+@lru_cache(maxsize=8192)
+def _cached_target_table_name(source_table_name: str) -> str:
+    """表名映射结果缓存：同一批源表名在每轮刷新中重复出现，命中后免去正则匹配"""
+    return SyncProperties._compute_target_table_name(source_table_name)
 
 
 class SyncProperties:
@@ -93,6 +180,11 @@ class SyncProperties:
         生成目标表名
         应用表名映射规则：table_runtime、table_uuid、table_数字 统一映射到 table
         """
+        return _cached_target_table_name(source_table_name)
+
+    @staticmethod
+    def _compute_target_table_name(source_table_name: str) -> str:
+        """实际的表名映射计算，仅在缓存未命中时执行"""
         if not source_table_name or not source_table_name.strip():
             return source_table_name
 
@@ -104,17 +196,19 @@ class SyncProperties:
         if source_table_name.endswith('_runtime'):
             return source_table_name[:-8]  # 移除 "_runtime"
 
-        # 2. 检查 9位数字后缀
-        last_underscore_index = source_table_name.rfind('_')
-        if last_underscore_index > 0:
-            suffix = source_table_name[last_underscore_index + 1:]
-            if SyncProperties._is_numeric_suffix(suffix):
-                return source_table_name[:last_underscore_index]
+        # 数字类后缀只可能出现在以数字结尾的表名上，先看末位字符再进分支
+        if source_table_name[-1].isdigit():
+            # 2. 检查 9位数字后缀
+            last_underscore_index = source_table_name.rfind('_')
+            if last_underscore_index > 0:
+                suffix = source_table_name[last_underscore_index + 1:]
+                if SyncProperties._is_numeric_suffix(suffix):
+                    return source_table_name[:last_underscore_index]
 
-        # 2a. 检查 9位数字_年度 格式
-        # 例如: order_bom_item_333367878_2018
-        if re.match(r'.*_\d{9}_\d{4}$', source_table_name):
-            return re.sub(r'_\d{9}_\d{4}$', '', source_table_name)
+            # 2a. 检查 9位数字_年度 格式
+            # 例如: order_bom_item_333367878_2018
+            if _RE_NUM9_YEAR.search(source_table_name):
+                return _RE_NUM9_YEAR.sub('', source_table_name)
 
         # 3. 检查各种UUID格式后缀
         extracted_base_name = SyncProperties._extract_table_name_from_uuid(source_table_name)
@@ -127,9 +221,7 @@ class SyncProperties:
     @staticmethod
     def _is_numeric_suffix(s: str) -> bool:
         """检查字符串是否为9位纯数字"""
-        if not s or not s.strip():
-            return False
-        return re.match(r'^\d{9}$', s) is not None
+        return bool(s) and len(s) == 9 and s.isdigit()
 
     @staticmethod
     def _extract_table_name_from_uuid(table_name: str) -> str:
@@ -143,23 +235,28 @@ class SyncProperties:
         if not table_name or '_' not in table_name:
             return table_name
 
+        # 快速预检：所有UUID模式去掉分隔符后结尾都至少是32位十六进制字符，
+        # 先用纯字符检查排除绝大多数无UUID后缀的表名，再进入正则匹配
+        if len(table_name) < 33:
+            return table_name
+        stripped_tail = _RE_SEP.sub('', table_name)[-32:]
+        if len(stripped_tail) < 32 or not all(c in _HEXSET for c in stripped_tail):
+            return table_name
+
         # 模式1: 下划线分隔的UUID格式 (8_4_4_4_12)
         # 例如: order_bom_0e9b60a4_d6ed_473d_a326_9e8c8f744ec2
-        pattern1 = r'_[0-9a-fA-F]{8}_[0-9a-fA-F]{4}_[0-9a-fA-F]{4}_[0-9a-fA-F]{4}_[0-9a-fA-F]{12}$'
-        if re.search(pattern1, table_name):
-            return re.sub(pattern1, '', table_name)
+        if _RE_UUID_UNDERSCORE.search(table_name):
+            return _RE_UUID_UNDERSCORE.sub('', table_name)
 
         # 模式2: 连字符分隔的UUID格式 (8-4-4-4-12)
         # 例如: users_a1b2c3d4-e5f6-7890-abcd-ef1234567890
-        pattern2 = r'_[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
-        if re.search(pattern2, table_name):
-            return re.sub(pattern2, '', table_name)
+        if _RE_UUID_HYPHEN.search(table_name):
+            return _RE_UUID_HYPHEN.sub('', table_name)
 
         # 模式3: 下划线分隔的UUID格式后跟年度 (8_4_4_4_12_年度)
         # 例如: order_bom_item_05355967_c503_4a2d_9dd1_2dd7a9ffa15e_2030
-        pattern3 = r'_[0-9a-fA-F]{8}_[0-9a-fA-F]{4}_[0-9a-fA-F]{4}_[0-9a-fA-F]{4}_[0-9a-fA-F]{12}_\d{4}$'
-        if re.search(pattern3, table_name):
-            return re.sub(pattern3, '', table_name)
+        if _RE_UUID_UNDERSCORE_YEAR.search(table_name):
+            return _RE_UUID_UNDERSCORE_YEAR.sub('', table_name)
 
         # 模式4: 混合格式 - 移除所有分隔符后检查是否为32位十六进制
         parts = table_name.split('_')
@@ -168,9 +265,9 @@ class SyncProperties:
             for i in range(len(parts) - 1, 0, -1):
                 possible_uuid_parts = parts[i:]
                 possible_uuid = '_'.join(possible_uuid_parts)
-                clean_uuid = re.sub(r'[-_]', '', possible_uuid)
+                clean_uuid = _RE_SEP.sub('', possible_uuid)
 
-                if len(clean_uuid) == 32 and re.match(r'^[0-9a-fA-F]{32}$', clean_uuid):
+                if len(clean_uuid) == 32 and set(clean_uuid) <= _HEXSET:
                     # 找到了UUID，返回基础表名
                     return '_'.join(parts[:i])
                 elif len(clean_uuid) > 32:
@@ -184,103 +281,127 @@ class StatsWidget(Static):
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        
-    def update_stats(self, tables: List[TableInfo], pg_iteration: int, mysql_iteration: int, start_time: datetime, 
-                    is_paused: bool = False, sort_by: str = "schema_table", filter_mode: str = "all"):
+        # 上一帧的markup内容，内容未变时跳过update
+        self._last_markup = ""
+        # (数据版本, 聚合结果)缓存：版本未变的帧直接复用，免去O(N)扫描
+        self._agg_cache: Optional[tuple] = None
+
+    def update_stats(self, tables: List[TableInfo], pg_iteration: int, mysql_iteration: int, start_time: datetime,
+                    is_paused: bool = False, sort_by: str = "schema_table", filter_mode: str = "all",
+                    tables_version: Optional[int] = None):
         """更新统计数据"""
-        # 过滤掉错误状态的表进行统计
-        valid_tables = [t for t in tables if t.pg_rows != -1 and t.mysql_rows != -1]
-        error_tables = [t for t in tables if t.pg_rows == -1 or t.mysql_rows == -1]
+        # 计数未变的帧（版本号相同）复用上一次的聚合结果
+        agg_key = (tables_version, id(tables))
+        if tables_version is not None and self._agg_cache is not None and self._agg_cache[0] == agg_key:
+            (total_pg_rows, total_mysql_rows, total_changes,
+             changed_count, consistent_count, error_count) = self._agg_cache[1]
+        else:
+            # 单次遍历完成全部统计（错误状态的表不计入数据量），
+            # 避免对tables做多轮O(N)列表推导扫描
+            total_pg_rows = 0
+            total_mysql_rows = 0
+            total_changes = 0
+            changed_count = 0
+            consistent_count = 0
+            error_count = 0
+
+            for t in tables:
+                if t.pg_rows == -1 or t.mysql_rows == -1:
+                    error_count += 1
+                else:
+                    total_pg_rows += t.pg_rows
+                    total_mysql_rows += t.mysql_rows
+                    change = t.change
+                    total_changes += change
+                    if change != 0:
+                        changed_count += 1
+                if t.is_consistent:
+                    consistent_count += 1
+
+            if tables_version is not None:
+                self._agg_cache = (agg_key, (total_pg_rows, total_mysql_rows, total_changes,
+                                             changed_count, consistent_count, error_count))
 
-        total_pg_rows = sum(t.pg_rows for t in valid_tables)
-        total_mysql_rows = sum(t.mysql_rows for t in valid_tables)
         total_diff = total_pg_rows - total_mysql_rows
-        total_changes = sum(t.change for t in valid_tables)
-        changed_count = len([t for t in valid_tables if t.change != 0])
-
-        # 一致性统计
-        consistent_count = len([t for t in tables if t.is_consistent])
         inconsistent_count = len(tables) - consistent_count
 
         # 运行时长
         runtime = datetime.now() - start_time
         runtime_str = self._format_duration(runtime.total_seconds())
 
-        # 构建显示文本
-        text = Text()
-        
-        # 标题行
-        text.append("🔍 PostgreSQL 数据库监控", style="bold blue")
-        text.append(f" - PG第{pg_iteration}次/MySQL第{mysql_iteration}次", style="dim")
-        text.append(f" - 运行时长: {runtime_str}", style="cyan")
-        
+        # 构建显示文本：拼接成单个markup字符串一次解析，替代几十次Text.append
+        parts = [
+            "[bold blue]🔍 PostgreSQL 数据库监控[/]",
+            f"[dim] - PG第{pg_iteration}次/MySQL第{mysql_iteration}次[/]",
+            f"[cyan] - 运行时长: {runtime_str}[/]",
+        ]
+
         # 状态和排序信息
         if is_paused:
-            text.append(" - ", style="dim")
-            text.append("⏸️ 已暂停", style="bold yellow")
-        
+            parts.append("[dim] - [/][bold yellow]⏸️ 已暂停[/]")
+
         # 排序和过滤信息
         sort_display = {
             "schema_table": "Schema.表名",
-            "data_diff": "数据差异", 
+            "data_diff": "数据差异",
             "pg_rows": "PG记录数",
             "mysql_rows": "MySQL记录数"
         }
         filter_display = {
             "all": "全部",
             "inconsistent": "不一致",
-            "consistent": "一致", 
+            "consistent": "一致",
             "error": "错误"
         }
-        text.append(f" - 排序: {sort_display.get(sort_by, sort_by)}", style="dim")
-        text.append(f" - 过滤: {filter_display.get(filter_mode, filter_mode)}", style="dim")
-        text.append(f" - 总计: {len(tables)} 个表", style="dim")
-        text.append("\n\n")
-        
+        parts.append(f"[dim] - 排序: {sort_display.get(sort_by, sort_by)}[/]")
+        parts.append(f"[dim] - 过滤: {filter_display.get(filter_mode, filter_mode)}[/]")
+        parts.append(f"[dim] - 总计: {len(tables)} 个表[/]")
+        parts.append("\n\n")
+
         # 数据量统计
-        text.append("📈 数据统计: ", style="bold")
-        text.append(f"PG总计: {total_pg_rows:,} 行, ", style="white")
-        text.append(f"MySQL总计: {total_mysql_rows:,} 行, ", style="white")
-        
+        parts.append("[bold]📈 数据统计: [/]")
+        parts.append(f"[white]PG总计: {total_pg_rows:,} 行, [/]")
+        parts.append(f"[white]MySQL总计: {total_mysql_rows:,} 行, [/]")
+
         # 数据差异颜色语义化
         if total_diff < 0:
-            text.append(f"数据差异: {total_diff:+,} 行", style="bold red")
+            parts.append(f"[bold red]数据差异: {total_diff:+,} 行[/]")
         elif total_diff > 0:
-            text.append(f"数据差异: {total_diff:+,} 行", style="bold green")
+            parts.append(f"[bold green]数据差异: {total_diff:+,} 行[/]")
         else:
-            text.append(f"数据差异: {total_diff:+,} 行", style="white")
-        text.append("\n")
-        
+            parts.append(f"[white]数据差异: {total_diff:+,} 行[/]")
+        parts.append("\n")
+
         # 变化和一致性统计
         if total_changes > 0:
-            text.append(f"🔄 本轮变化: +{total_changes:,} 行", style="bold green")
+            parts.append(f"[bold green]🔄 本轮变化: +{total_changes:,} 行[/]")
         elif total_changes < 0:
-            text.append(f"🔄 本轮变化: {total_changes:+,} 行", style="bold red")
+            parts.append(f"[bold red]🔄 本轮变化: {total_changes:+,} 行[/]")
         else:
-            text.append(f"🔄 本轮变化: {total_changes:+,} 行", style="white")
-        
-        text.append(f" ({changed_count} 个表有变化), ", style="white")
-        text.append(f"一致性: {consistent_count} 个一致", style="bold green")
-        
+            parts.append(f"[white]🔄 本轮变化: {total_changes:+,} 行[/]")
+
+        parts.append(f"[white] ({changed_count} 个表有变化), [/]")
+        parts.append(f"[bold green]一致性: {consistent_count} 个一致[/]")
+
         if inconsistent_count > 0:
-            text.append(f", {inconsistent_count} 个不一致", style="bold red")
-        if len(error_tables) > 0:
-            text.append(f", {len(error_tables)} 个错误", style="bold red")
-        
-        text.append("\n")
-        
+            parts.append(f"[bold red], {inconsistent_count} 个不一致[/]")
+        if error_count > 0:
+            parts.append(f"[bold red], {error_count} 个错误[/]")
+
+        parts.append("\n")
+
         # 进度信息和同步速度 - 带进度条和速度估算
         if total_mysql_rows > 0:
             completion_rate = min(total_pg_rows / total_mysql_rows, 1.0)
             completion_percent = completion_rate * 100
-            
-            text.append("📊 同步进度: ", style="bold cyan")
-            
+
+            parts.append("[bold cyan]📊 同步进度: [/]")
+
             # 创建进度条
             bar_width = 20
             filled_width = int(bar_width * completion_rate)
             empty_width = bar_width - filled_width
-            
+
             # 进度条颜色根据完成率
             if completion_rate >= 0.95:
                 bar_color = "bold green"
@@ -288,30 +409,34 @@ class StatsWidget(Static):
                 bar_color = "bold yellow"
             else:
                 bar_color = "bold red"
-            
+
             # 显示进度条
-            text.append("█" * filled_width, style=bar_color)
-            text.append("░" * empty_width, style="dim")
-            text.append(f" {completion_percent:.1f}%", style="bold white")
-            text.append(f" ({total_pg_rows:,}/{total_mysql_rows:,})", style="dim")
-            
+            parts.append(f"[{bar_color}]{'█' * filled_width}[/]")
+            parts.append(f"[dim]{'░' * empty_width}[/]")
+            parts.append(f"[bold white] {completion_percent:.1f}%[/]")
+            parts.append(f"[dim] ({total_pg_rows:,}/{total_mysql_rows:,})[/]")
+
             if completion_rate >= 1.0:
-                text.append(" - 已完成", style="bold green")
+                parts.append("[bold green] - 已完成[/]")
             else:
                 remaining = total_mysql_rows - total_pg_rows
-                text.append(f" - 剩余: {remaining:,} 行", style="dim")
-                
+                parts.append(f"[dim] - 剩余: {remaining:,} 行[/]")
+
                 # 计算同步速度和预估时间
                 if hasattr(self, 'parent_app') and self.parent_app:
                     speed = self.parent_app.calculate_sync_speed()
                     if speed > 0:
-                        text.append(f" - 速度: {speed:.1f} 行/秒", style="bright_blue")
+                        parts.append(f"[bright_blue] - 速度: {speed:.1f} 行/秒[/]")
                         estimated_time = self.parent_app.estimate_remaining_time(total_mysql_rows, total_pg_rows, speed)
-                        text.append(f" - 预估: {estimated_time}", style="bright_blue")
+                        parts.append(f"[bright_blue] - 预估: {estimated_time}[/]")
                     else:
-                        text.append(" - 速度: 计算中...", style="dim")
-        
-        self.update(text)
+                        parts.append("[dim] - 速度: 计算中...[/]")
+
+        content = "".join(parts)
+        # 内容与上一帧相同（例如暂停时）直接跳过渲染
+        if content != self._last_markup:
+            self._last_markup = content
+            self.update(content)
     
     def _format_duration(self, seconds: float) -> str:
         """格式化时长显示"""
@@ -387,6 +512,7 @@ class MonitorApp(App[None]):
         self.mysql_config = None
         self.monitor_config = {}
         self.tables: List[TableInfo] = []
+        self.target_tables: Dict[str, Dict[str, TableInfo]] = {}  # schema -> 目标表名 -> TableInfo
         self.iteration = 0
         self.sync_props = SyncProperties()
         self.start_time = datetime.now()
@@ -395,6 +521,7 @@ class MonitorApp(App[None]):
         self.pg_iteration = 0
         self.mysql_iteration = 0
         self.mysql_update_interval = 3
+        self.exact_count_interval = 20
         self.first_mysql_update = True
         self.first_pg_update = True
         self.pg_updating = False
@@ -402,28 +529,42 @@ class MonitorApp(App[None]):
         # 停止标志，用于优雅退出
         self.stop_event = asyncio.Event()
 
-        # 异步更新支持
-        self.mysql_update_lock = asyncio.Lock()
-        self.mysql_update_tasks = []
-        self.pg_update_lock = asyncio.Lock()
-        self.pg_update_tasks = []
+        # 连接池（跨刷新周期复用，避免每次刷新重新握手）
+        self.mysql_pools: Dict[str, aiomysql.Pool] = {}
+        self.pg_pool: Optional[asyncpg.Pool] = None
 
-        # 进度跟踪
-        self.history_data = []
+        # 异步更新支持。写回TableInfo的代码段都不含await点，
+        # 在单线程事件循环里天然原子，因此不需要Lock
+        # 任务集合由done-callback自动清理，无需每轮线性过滤
+        self.mysql_update_tasks = set()
+        self.pg_update_tasks = set()
+        # 正在更新中的PG schema集合，避免调度时逐表扫描pg_updating标记
+        self._pg_schemas_updating: set = set()
+
+        # 进度跟踪（deque自动淘汰最老的数据点，免去手工截断）
         self.max_history_points = 20
+        self.history_data = deque(maxlen=self.max_history_points)
 
         # 定时器
         self.refresh_timer: Optional[Timer] = None
 
+        # 行渲染缓存：full_name -> (指纹, 渲染好的单元格元组)
+        self._row_render_cache: Dict[str, tuple] = {}
+
+        # 过滤+排序结果缓存：计数写回时递增版本号使其失效，
+        # 数据没变的帧不再对全部表重新排序
+        self._tables_version = 0
+        self._display_cache_key: Optional[tuple] = None
+        self._display_tables: List[TableInfo] = []
+
+        # 上一帧全部行的(表名, 指纹)列表，整帧无变化时跳过DataTable重建
+        self._last_frame_sig: List[tuple] = []
+
         # 界面控制属性
         self.is_paused = False
         self.sort_by = "schema_table"  # 可选: schema_table, data_diff, pg_rows, mysql_rows
         self.filter_mode = "all"  # 可选: all, inconsistent, consistent, error
 
-        # 信号处理
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
-        
     def compose(self) -> ComposeResult:
         """构建UI组件"""
         yield Header()
@@ -448,9 +589,19 @@ class MonitorApp(App[None]):
             "MySQL更新时间", "源表数量"
         )
         
+        # 信号处理：通过事件循环注册，退出逻辑在循环内执行，
+        # 复用action_quit的清理路径（取消任务、关闭连接池）
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.action_quit)
+            except NotImplementedError:
+                # Windows等平台不支持add_signal_handler，退回同步注册
+                signal.signal(sig, self._signal_handler)
+
         # 启动监控任务
         self.call_later(self.start_monitoring)
-        
+
     async def start_monitoring(self):
         """启动监控任务"""
         if not await self.load_config():
@@ -458,12 +609,12 @@ class MonitorApp(App[None]):
             return
             
         # 初始化数据库连接测试
-        pg_conn = await self.connect_postgresql()
-        if not pg_conn:
+        # 连接池在此处创建并完成连通性校验，之后所有PG访问复用池内连接
+        pool = await self.get_pg_pool()
+        if not pool:
             self.exit(1)
             return
-        await pg_conn.close()
-        
+
         # 初始化表结构
         target_tables = await self.initialize_tables_from_mysql()
         total_tables = sum(len(tables_dict) for tables_dict in target_tables.values())
@@ -473,21 +624,19 @@ class MonitorApp(App[None]):
             return
             
         # 第一次数据更新
-        pg_conn = await self.connect_postgresql()
-        if pg_conn:
-            await self.get_postgresql_rows_from_pg_stat(pg_conn, target_tables)
-            await pg_conn.close()
-            self.first_pg_update = False
+        await self.get_postgresql_rows_from_pg_stat(target_tables)
+        self.first_pg_update = False
             
+        # 首次MySQL计数放后台任务执行，不阻塞首帧渲染；
+        # 结果在下一个刷新周期自然进入显示
         self.mysql_iteration += 1
-        await self.update_mysql_counts(target_tables, use_information_schema=True)
+        await self.update_mysql_counts_async(target_tables, use_information_schema=True)
         self.first_mysql_update = False
         
-        # 转换为列表格式
-        self.tables = []
-        for schema_name, tables_dict in target_tables.items():
-            for table_info in tables_dict.values():
-                self.tables.append(table_info)
+        # 表集合只在初始化时变化，两种视图都物化一次后复用
+        self.target_tables = target_tables
+        self.tables = [table_info for tables_dict in target_tables.values()
+                       for table_info in tables_dict.values()]
                 
         # 更新显示
         self.update_display()
@@ -508,7 +657,8 @@ class MonitorApp(App[None]):
             self.start_time,
             self.is_paused,
             self.sort_by,
-            self.filter_mode
+            self.filter_mode,
+            tables_version=self._tables_version
         )
         
         # 更新数据表格
@@ -543,121 +693,71 @@ class MonitorApp(App[None]):
     def _update_data_table(self):
         """更新数据表格"""
         table = self.query_one("#tables", DataTable)
-        
-        # 先过滤再排序
-        filtered_tables = self._filter_tables(self.tables)
-        sorted_tables = self._sort_tables(filtered_tables)
-        
+
+        # 本帧统一使用同一个当前时间，避免每行两次取时间
+        frame_now = time.time()
+
+        # 先过滤再排序；数据、排序和过滤条件都没变时直接复用上一帧的结果
+        cache_key = (self._tables_version, id(self.tables), self.sort_by, self.filter_mode)
+        if cache_key != self._display_cache_key:
+            self._display_tables = self._sort_tables(self._filter_tables(self.tables))
+            self._display_cache_key = cache_key
+        sorted_tables = self._display_tables
+
+        # 先计算每行指纹和单元格，整帧没有任何行变化时完全跳过表格重建
+        frame_sig = []
+        frame_rows = []
+        for t in sorted_tables:
+            # 相对时间字符串参与指纹：时间桶变化时该行必须重新渲染
+            pg_time_str = "" if t.pg_updating else self.get_relative_time(t.last_updated, frame_now)
+            mysql_time_str = "" if t.mysql_updating else self.get_relative_time(t.mysql_last_updated, frame_now)
+
+            # 数据未变化的行直接复用上次渲染好的单元格，跳过全部格式化分支
+            fingerprint = (t.pg_rows, t.mysql_rows, t.change,
+                           t.pg_updating, t.mysql_updating,
+                           t.pg_is_estimated, t.mysql_is_estimated,
+                           pg_time_str, mysql_time_str,
+                           len(t.mysql_source_tables))
+            cached = self._row_render_cache.get(t.full_name)
+            if cached is not None and cached[0] == fingerprint:
+                cells = cached[1]
+            else:
+                cells = self._render_row_cells(t, pg_time_str, mysql_time_str)
+                self._row_render_cache[t.full_name] = (fingerprint, cells)
+
+            frame_sig.append((t.full_name, fingerprint))
+            frame_rows.append(cells)
+
+        if frame_sig == self._last_frame_sig:
+            return
+
+        # 行集合与顺序未变时只原地更新变化行的单元格，
+        # 避免clear+add_row整表重建（光标与滚动位置也天然保留）
+        if (len(frame_sig) == len(self._last_frame_sig)
+                and table.row_count == len(frame_sig)
+                and all(new[0] == old[0] for new, old in zip(frame_sig, self._last_frame_sig))):
+            for row_index, (new, old) in enumerate(zip(frame_sig, self._last_frame_sig)):
+                if new[1] == old[1]:
+                    continue
+                for col_index, value in enumerate(frame_rows[row_index], start=1):
+                    # update_width=True：计数增长导致内容变宽时列宽要跟着扩
+                    table.update_cell_at(Coordinate(row_index, col_index), value,
+                                         update_width=True)
+            self._last_frame_sig = frame_sig
+            return
+
+        self._last_frame_sig = frame_sig
+
         # 保存当前光标位置和滚动位置
         current_cursor = table.cursor_coordinate if table.row_count > 0 else None
         current_scroll_y = table.scroll_y if hasattr(table, 'scroll_y') else 0
-        
+
         # 清空表格并重新填充
         table.clear()
-        
-        for i, t in enumerate(sorted_tables, 1):
-            # 状态图标
-            if t.pg_rows == -1 or t.mysql_rows == -1:
-                icon = "❌"
-            elif t.is_consistent:
-                icon = "✅"
-            else:
-                icon = "⚠️"
-                
-            # 数据差异文本和样式 - 零值与变化量保持一致
-            if t.pg_rows == -1 or t.mysql_rows == -1:
-                diff_text = "[bold bright_red]ERROR[/]"  # 错误状态用亮红色
-            else:
-                # 根据差异大小和方向使用不同颜色
-                if t.data_diff < 0:
-                    diff_text = f"[bold orange3]{t.data_diff:+,}[/]"  # 负数用橙色（PG落后）
-                elif t.data_diff > 0:
-                    diff_text = f"[bold bright_green]{t.data_diff:+,}[/]"  # 正数用亮绿色（PG领先）
-                else:
-                    diff_text = "[dim white]0[/]"  # 零用暗白色（与变化量一致）
-                
-            # 变化量文本和样式 - 去掉无变化时的横线
-            if t.pg_rows == -1:
-                change_text = "[bold bright_red]ERROR[/]"
-            elif t.change > 0:
-                change_text = f"[bold spring_green3]+{t.change:,} ⬆[/]"  # 增加用春绿色
-            elif t.change < 0:
-                change_text = f"[bold orange3]{t.change:,} ⬇[/]"  # 减少用橙色
-            else:
-                change_text = "[dim white]0[/]"  # 无变化只显示0，与数据差异保持一致
-                
-            # MySQL更新时间和样式 - 与PG更新时间保持一致
-            if t.mysql_updating:
-                mysql_status = "[yellow3]更新中[/]"  # 使用更温和的深黄色
-            else:
-                mysql_relative_time = self.get_relative_time(t.mysql_last_updated)
-                if "年前" in mysql_relative_time or "个月前" in mysql_relative_time:
-                    mysql_status = f"[bold orange1]{mysql_relative_time}[/]"  # 很久没更新用橙色
-                elif "天前" in mysql_relative_time:
-                    mysql_status = f"[bold yellow3]{mysql_relative_time}[/]"  # 几天前用深黄色
-                elif "小时前" in mysql_relative_time:
-                    mysql_status = f"[bright_cyan]{mysql_relative_time}[/]"  # 几小时前用亮青色
-                else:
-                    mysql_status = f"[dim bright_black]{mysql_relative_time}[/]"  # 最近更新用暗色（与PG一致）
-                
-            # 记录数显示和样式 - 区分估计值和精确值
-            if t.pg_rows == -1:
-                pg_rows_display = "[bold bright_red]ERROR[/]"
-            elif t.pg_is_estimated:
-                pg_rows_display = f"[italic bright_blue]~{t.pg_rows:,}[/]"  # 估计值用斜体亮蓝色
-            else:
-                pg_rows_display = f"[bold bright_cyan]{t.pg_rows:,}[/]"  # 精确值用亮青色粗体
-                
-            if t.mysql_rows == -1:
-                mysql_rows_display = "[bold bright_red]ERROR[/]"
-            elif t.mysql_is_estimated:
-                mysql_rows_display = f"[italic medium_purple1]~{t.mysql_rows:,}[/]"  # 估计值用斜体中紫色
-            else:
-                mysql_rows_display = f"[bold bright_magenta]{t.mysql_rows:,}[/]"  # 精确值用亮洋红色粗体
-            
-            # Schema名称和表名样式 - 使用更清晰的颜色
-            schema_display = f"[bold medium_purple3]{t.schema_name[:12] + '...' if len(t.schema_name) > 15 else t.schema_name}[/]"  # Schema用中紫色
-            table_display = f"[bold dodger_blue2]{t.target_table_name[:35] + '...' if len(t.target_table_name) > 38 else t.target_table_name}[/]"  # 表名用道奇蓝色
-            
-            # PG更新时间样式 - 区分更新状态，使用更温和的颜色
-            if t.pg_updating:
-                pg_time_display = "[yellow3]更新中[/]"  # 使用更温和的深黄色
-            else:
-                pg_relative_time = self.get_relative_time(t.last_updated)
-                if "年前" in pg_relative_time or "个月前" in pg_relative_time:
-                    pg_time_display = f"[bold orange1]{pg_relative_time}[/]"  # 很久没更新用橙色
-                elif "天前" in pg_relative_time:
-                    pg_time_display = f"[bold yellow3]{pg_relative_time}[/]"  # 几天前用深黄色
-                elif "小时前" in pg_relative_time:
-                    pg_time_display = f"[bright_cyan]{pg_relative_time}[/]"  # 几小时前用亮青色
-                else:
-                    pg_time_display = f"[dim bright_black]{pg_relative_time}[/]"  # 最近更新用暗色
-            
-            # 源表数量样式 - 使用原来MySQL更新时间的颜色方案
-            source_count = len(t.mysql_source_tables)
-            if source_count >= 5:
-                source_count_display = f"[bold orange1]{source_count}[/]"  # 源表多用橙色
-            elif source_count >= 3:
-                source_count_display = f"[bold yellow3]{source_count}[/]"  # 中等数量用深黄色
-            elif source_count >= 2:
-                source_count_display = f"[bright_cyan]{source_count}[/]"  # 少量用亮青色
-            else:
-                source_count_display = f"[dim bright_white]{source_count}[/]"  # 单表用暗亮白色
-            
-            # 添加行到表格
-            table.add_row(
-                str(i),
-                icon,
-                schema_display,
-                table_display,
-                pg_rows_display,
-                mysql_rows_display,
-                diff_text,
-                change_text,
-                pg_time_display,
-                mysql_status,
-                source_count_display
-            )
+
+        for i, cells in enumerate(frame_rows, 1):
+            # 添加行到表格（序号随排序/过滤变化，单独生成）
+            table.add_row(str(i), *cells)
         
         # 尝试恢复光标位置和滚动位置
         if current_cursor is not None and table.row_count > 0:
@@ -672,6 +772,80 @@ class MonitorApp(App[None]):
             except Exception:
                 pass  # 如果恢复失败，保持默认位置
     
+    def _render_row_cells(self, t: TableInfo, pg_time_str: str, mysql_time_str: str) -> tuple:
+        """渲染单行除序号外的全部单元格（结果按行指纹缓存）"""
+        # 状态图标
+        if t.pg_rows == -1 or t.mysql_rows == -1:
+            icon = "❌"
+        elif t.is_consistent:
+            icon = "✅"
+        else:
+            icon = "⚠️"
+
+        # 数据差异文本和样式 - 零值与变化量保持一致
+        if t.pg_rows == -1 or t.mysql_rows == -1:
+            diff_text = "[bold bright_red]ERROR[/]"  # 错误状态用亮红色
+        else:
+            # 按差异符号查表取markup模板
+            diff_text = _DIFF_MARKUP[(t.data_diff > 0) - (t.data_diff < 0)].format(t.data_diff)
+
+        # 变化量文本和样式 - 去掉无变化时的横线
+        if t.pg_rows == -1:
+            change_text = "[bold bright_red]ERROR[/]"
+        else:
+            change_text = _CHANGE_MARKUP[(t.change > 0) - (t.change < 0)].format(t.change)
+
+        # MySQL更新时间和样式 - 与PG更新时间保持一致
+        if t.mysql_updating:
+            mysql_status = "[yellow3]更新中[/]"  # 使用更温和的深黄色
+        else:
+            mysql_status = _styled_time_str(mysql_time_str)
+
+        # 记录数显示和样式 - 区分估计值和精确值
+        if t.pg_rows == -1:
+            pg_rows_display = "[bold bright_red]ERROR[/]"
+        elif t.pg_is_estimated:
+            pg_rows_display = f"[italic bright_blue]~{t.pg_rows:,}[/]"  # 估计值用斜体亮蓝色
+        else:
+            pg_rows_display = f"[bold bright_cyan]{t.pg_rows:,}[/]"  # 精确值用亮青色粗体
+
+        if t.mysql_rows == -1:
+            mysql_rows_display = "[bold bright_red]ERROR[/]"
+        elif t.mysql_is_estimated:
+            mysql_rows_display = f"[italic medium_purple1]~{t.mysql_rows:,}[/]"  # 估计值用斜体中紫色
+        else:
+            mysql_rows_display = f"[bold bright_magenta]{t.mysql_rows:,}[/]"  # 精确值用亮洋红色粗体
+
+        # PG更新时间样式 - 区分更新状态，使用更温和的颜色
+        if t.pg_updating:
+            pg_time_display = "[yellow3]更新中[/]"  # 使用更温和的深黄色
+        else:
+            pg_time_display = _styled_time_str(pg_time_str)
+
+        # 源表数量样式 - 使用原来MySQL更新时间的颜色方案
+        source_count = len(t.mysql_source_tables)
+        if source_count >= 5:
+            source_count_display = f"[bold orange1]{source_count}[/]"  # 源表多用橙色
+        elif source_count >= 3:
+            source_count_display = f"[bold yellow3]{source_count}[/]"  # 中等数量用深黄色
+        elif source_count >= 2:
+            source_count_display = f"[bright_cyan]{source_count}[/]"  # 少量用亮青色
+        else:
+            source_count_display = f"[dim bright_white]{source_count}[/]"  # 单表用暗亮白色
+
+        return (
+            icon,
+            t.schema_display,
+            t.table_display,
+            pg_rows_display,
+            mysql_rows_display,
+            diff_text,
+            change_text,
+            pg_time_display,
+            mysql_status,
+            source_count_display
+        )
+
     def _restore_scroll_position(self, table: DataTable, scroll_y: int):
         """恢复滚动位置的辅助方法"""
         try:
@@ -690,17 +864,17 @@ class MonitorApp(App[None]):
         if self.stop_event.is_set() or self.is_paused:
             return
             
-        # 重新构建target_tables结构用于更新
-        target_tables = {}
-        for table_info in self.tables:
-            schema_name = table_info.schema_name
-            if schema_name not in target_tables:
-                target_tables[schema_name] = {}
-            target_tables[schema_name][table_info.target_table_name] = table_info
-            
-        # 更新PostgreSQL记录数
+        # 初始化时物化的schema视图，表集合不变，无需每轮重建
+        target_tables = self.target_tables
+
+
+        # 更新PostgreSQL记录数：常态走pg_class.reltuples估计值（单次目录查询），
+        # 每exact_count_interval轮才做一次精确COUNT校准，避免大表上持续全表扫描
         self.pg_iteration += 1
-        await self.update_postgresql_counts_async(target_tables)
+        if self.exact_count_interval <= 1 or self.pg_iteration % self.exact_count_interval == 0:
+            await self.update_postgresql_counts_async(target_tables)
+        else:
+            await self.get_postgresql_rows_from_pg_stat(target_tables)
         
         # 按间隔更新MySQL记录数
         if self.pg_iteration % self.mysql_update_interval == 0:
@@ -718,6 +892,16 @@ class MonitorApp(App[None]):
         self.stop_event.set()
         if self.refresh_timer:
             self.refresh_timer.stop()
+        # 直接取消在途更新任务，退出不等待正在执行的COUNT查询
+        for task in self.mysql_update_tasks:
+            task.cancel()
+        for task in self.pg_update_tasks:
+            task.cancel()
+        # 关闭连接池（wait_closed需要事件循环，退出路径只做同步关闭）
+        for pool in self.mysql_pools.values():
+            pool.close()
+        if self.pg_pool is not None:
+            self.pg_pool.terminate()
         self.exit()
         
     def action_refresh(self) -> None:
@@ -744,41 +928,20 @@ class MonitorApp(App[None]):
         self.update_display()
         
     def _signal_handler(self, signum, frame):
-        """信号处理器"""
+        """信号处理器（仅在不支持add_signal_handler的平台上作为后备）"""
         self.stop_event.set()
         self.exit()
 
-    def get_relative_time(self, target_time: datetime) -> str:
-        """获取相对时间显示"""
-        now = datetime.now()
-        diff = now - target_time
-
-        # 计算总秒数
-        total_seconds = int(diff.total_seconds())
-
-        if total_seconds < 0:
-            return "刚刚"
-        elif total_seconds < 60:
-            return f"{total_seconds}秒前"
-        elif total_seconds < 3600:  # 小于1小时
-            minutes = total_seconds // 60
-            return f"{minutes}分钟前"
-        elif total_seconds < 86400:  # 小于1天
-            hours = total_seconds // 3600
-            return f"{hours}小时前"
-        elif total_seconds < 2592000:  # 小于30天
-            days = total_seconds // 86400
-            return f"{days}天前"
-        elif total_seconds < 31536000:  # 小于1年
-            months = total_seconds // 2592000
-            return f"{months}个月前"
-        else:
-            years = total_seconds // 31536000
-            return f"{years}年前"
+    def get_relative_time(self, target_time: float, now: Optional[float] = None) -> str:
+        """获取相对时间显示（now可由调用方传入，避免每行重复取当前时间）"""
+        if now is None:
+            now = time.time()
+        return _relative_time_str(int(now - target_time))
 
     def update_progress_data(self, tables: List[TableInfo]):
         """更新进度数据，计算总数和变化量"""
-        current_time = datetime.now()
+        # 速度计算只用时间差，monotonic不受系统时钟回拨影响
+        current_time = time.monotonic()
 
         # 过滤掉错误状态的表进行统计
         valid_tables = [t for t in tables if t.pg_rows != -1 and t.mysql_rows != -1]
@@ -787,26 +950,22 @@ class MonitorApp(App[None]):
         total_mysql_rows = sum(t.mysql_rows for t in valid_tables)
         total_pg_change = sum(t.change for t in valid_tables)
 
-        # 添加到历史数据
+        # 添加到历史数据（超过maxlen时deque自动丢弃最老的点）
         self.history_data.append((current_time, total_pg_rows, total_mysql_rows, total_pg_change))
 
-        # 保持历史数据在指定范围内
-        if len(self.history_data) > self.max_history_points:
-            self.history_data.pop(0)
-
     def calculate_sync_speed(self) -> float:
         """计算同步速度（记录/秒）"""
         if len(self.history_data) < 2:
             return 0.0
 
-        # 使用最近的数据点计算速度
-        recent_data = self.history_data[-min(10, len(self.history_data)):]
+        # 使用最近的数据点计算速度（deque不支持切片，先转list）
+        recent_data = list(self.history_data)[-10:]
 
         if len(recent_data) < 2:
             return 0.0
 
         # 计算时间跨度和总变化量
-        time_span = (recent_data[-1][0] - recent_data[0][0]).total_seconds()
+        time_span = recent_data[-1][0] - recent_data[0][0]
         if time_span <= 0:
             return 0.0
 
@@ -876,7 +1035,9 @@ class MonitorApp(App[None]):
                 username=mysql_section['username'],
                 password=mysql_section['password'],
                 databases=databases_list,
-                ignored_prefixes=mysql_section.get('ignored_table_prefixes', '').split(',')
+                ignored_prefixes=tuple(
+                    p.strip() for p in mysql_section.get('ignored_table_prefixes', '').split(',')
+                    if p.strip())
             )
 
             # 监控配置
@@ -884,406 +1045,499 @@ class MonitorApp(App[None]):
             self.monitor_config = {
                 'refresh_interval': int(monitor_section.get('refresh_interval', 3)),
                 'mysql_update_interval': int(monitor_section.get('mysql_update_interval', 3)),
+                'exact_count_interval': int(monitor_section.get('exact_count_interval', 20)),
             }
 
             self.mysql_update_interval = self.monitor_config['mysql_update_interval']
+            self.exact_count_interval = self.monitor_config['exact_count_interval']
             return True
 
         except Exception as e:
             return False
 
-    async def connect_postgresql(self):
-        """连接PostgreSQL"""
+    async def get_pg_pool(self):
+        """获取PostgreSQL连接池（懒创建，支持并发COUNT查询）"""
+        if self.pg_pool is not None:
+            return self.pg_pool
+
         try:
-            conn = await asyncpg.connect(
+            self.pg_pool = await asyncpg.create_pool(
                 host=self.pg_config.host,
                 port=self.pg_config.port,
                 database=self.pg_config.database,
                 user=self.pg_config.username,
                 password=self.pg_config.password,
-                timeout=10
+                min_size=2,
+                max_size=8,
+                command_timeout=30
             )
-            return conn
         except Exception as e:
             return None
 
-    async def connect_mysql(self, database: str):
-        """连接MySQL"""
+        return self.pg_pool
+
+    async def get_mysql_pool(self, database: str):
+        """获取指定数据库的MySQL连接池（懒创建，跨刷新周期复用）"""
+        pool = self.mysql_pools.get(database)
+        if pool is not None:
+            return pool
+
         try:
-            conn = await aiomysql.connect(
+            pool = await aiomysql.create_pool(
                 host=self.mysql_config.host,
                 port=self.mysql_config.port,
                 db=database,
                 user=self.mysql_config.username,
                 password=self.mysql_config.password,
+                minsize=1,
+                maxsize=4,
                 connect_timeout=5,
-                charset='utf8mb4'
+                charset='utf8mb4',
+                autocommit=True
             )
-            return conn
         except Exception as e:
             return None
 
+        self.mysql_pools[database] = pool
+        return pool
+
+    async def _get_any_mysql_pool(self, schema_names: List[str]) -> Optional[aiomysql.Pool]:
+        """取任意一个可用库的连接池（information_schema是实例级视图，连哪个库都行）
+
+        逐个尝试，避免第一个库配置错误或不可达时放弃整个实例。
+        """
+        for schema_name in schema_names:
+            pool = await self.get_mysql_pool(schema_name)
+            if pool:
+                return pool
+        return None
+
     async def initialize_tables_from_mysql(self):
         """从MySQL初始化表结构"""
         schema_tables = {}
-        
-        for schema_name in self.mysql_config.databases:
-            schema_name = schema_name.strip()
-            if not schema_name:
-                continue
 
-            mysql_conn = await self.connect_mysql(schema_name)
-            if not mysql_conn:
-                continue
+        schema_names = [s.strip() for s in self.mysql_config.databases if s.strip()]
+        if not schema_names:
+            return schema_tables
+
+        # information_schema是服务级视图，一条IN查询即可取回所有schema的表清单，
+        # 避免每个schema一次连接+一次查询往返
+        pool = await self._get_any_mysql_pool(schema_names)
+        if not pool:
+            return schema_tables
+
+        placeholders = ','.join(['%s'] * len(schema_names))
+        async with pool.acquire() as mysql_conn:
+            async with mysql_conn.cursor() as cursor:
+                await cursor.execute(f"""
+                    SELECT TABLE_SCHEMA, TABLE_NAME
+                    FROM INFORMATION_SCHEMA.TABLES
+                    WHERE TABLE_SCHEMA IN ({placeholders})
+                      AND TABLE_TYPE = 'BASE TABLE'
+                """, schema_names)
+                rows = await cursor.fetchall()
+
+        # 按schema分组并过滤忽略前缀（startswith接受元组，单次C层调用完成匹配）
+        ignored_prefixes = self.mysql_config.ignored_prefixes
+        schema_table_names: Dict[str, List[str]] = {}
+        for schema_name, table_name in rows:
+            if not (ignored_prefixes and table_name.startswith(ignored_prefixes)):
+                schema_table_names.setdefault(schema_name, []).append(table_name)
+
+        for schema_name in schema_names:
+            mysql_table_names = schema_table_names.get(schema_name, [])
+
+            # 按目标表名分组
+            target_tables = {}
+            for mysql_table_name in mysql_table_names:
+                target_table_name = self.sync_props.get_target_table_name(mysql_table_name)
+
+                if target_table_name not in target_tables:
+                    current_time = time.time()
+                    target_tables[target_table_name] = TableInfo(
+                        schema_name=schema_name,
+                        target_table_name=target_table_name,
+                        mysql_rows=0,
+                        mysql_last_updated=current_time - 365 * 86400,
+                        last_updated=current_time
+                    )
+                    target_tables[target_table_name].mysql_source_tables.append(mysql_table_name)
+                else:
+                    target_tables[target_table_name].mysql_source_tables.append(mysql_table_name)
 
-            try:
+            if target_tables:
+                # 发现阶段结束后冻结源表列表：刷新路径只读不写，
+                # 也保证表名映射（正则）只在发现时执行一次
+                for table_info in target_tables.values():
+                    table_info.mysql_source_tables = tuple(table_info.mysql_source_tables)
+                schema_tables[schema_name] = target_tables
+
+        return schema_tables
+
+
+
+    async def _update_mysql_counts_from_information_schema(
+            self, target_tables: Dict[str, Dict[str, TableInfo]]) -> bool:
+        """一次information_schema查询取回全部库的行数估计值"""
+        current_time = time.time()
+
+        if self.stop_event.is_set() or not target_tables:
+            return False
+
+        schema_names = list(target_tables)
+        try:
+            # information_schema是实例级视图，任选一个可用库的连接池即可
+            pool = await self._get_any_mysql_pool(schema_names)
+            if not pool:
+                return False
+
+            async with pool.acquire() as mysql_conn:
+                # MySQL 8查询information_schema.tables可能触发InnoDB统计刷新，
+                # 强制使用缓存统计信息（5.7没有该变量，忽略报错）
+                try:
+                    async with mysql_conn.cursor() as cursor:
+                        await cursor.execute(
+                            "SET SESSION information_schema_stats_expiry = 86400")
+                except Exception:
+                    pass
+
+                # 所有库合并为一次查询，往返次数与库数量无关
+                placeholders = ','.join(['%s'] * len(schema_names))
                 async with mysql_conn.cursor() as cursor:
-                    await cursor.execute("""
-                        SELECT TABLE_NAME
-                        FROM INFORMATION_SCHEMA.TABLES
-                        WHERE TABLE_SCHEMA = %s
-                          AND TABLE_TYPE = 'BASE TABLE'
-                    """, (schema_name,))
-
-                    mysql_table_names = []
+                    await cursor.execute(f"""
+                                         SELECT table_schema, table_name, table_rows
+                                         FROM information_schema.tables
+                                         WHERE table_schema IN ({placeholders})
+                                           AND table_type = 'BASE TABLE'
+                                         """, schema_names)
                     rows = await cursor.fetchall()
-                    for row in rows:
-                        table_name = row[0]
-                        if not any(table_name.startswith(prefix.strip())
-                                 for prefix in self.mysql_config.ignored_prefixes if prefix.strip()):
-                            mysql_table_names.append(table_name)
-
-                # 按目标表名分组
-                target_tables = {}
-                for mysql_table_name in mysql_table_names:
-                    target_table_name = self.sync_props.get_target_table_name(mysql_table_name)
-
-                    if target_table_name not in target_tables:
-                        current_time = datetime.now()
-                        target_tables[target_table_name] = TableInfo(
-                            schema_name=schema_name,
-                            target_table_name=target_table_name,
-                            mysql_rows=0,
-                            mysql_last_updated=current_time - timedelta(days=365),
-                            last_updated=current_time
-                        )
-                        target_tables[target_table_name].mysql_source_tables.append(mysql_table_name)
-                    else:
-                        target_tables[target_table_name].mysql_source_tables.append(mysql_table_name)
 
-                if target_tables:
-                    schema_tables[schema_name] = target_tables
+            # 建立(库, 表名)到行数的映射
+            table_rows_map = {(s, t): (r or 0) for s, t, r in rows}  # 处理NULL值
 
-            finally:
-                mysql_conn.close()
+            # 写回段没有await点，事件循环内天然原子，无需加锁
+            for schema_name, tables_dict in target_tables.items():
+                for table_info in tables_dict.values():
+                    if table_info.mysql_updating:
+                        continue  # 如果正在更新中，跳过
 
-        return schema_tables
+                    # 累加所有源表的估计行数
+                    table_info.mysql_rows = sum(
+                        table_rows_map.get((schema_name, name), 0)
+                        for name in table_info.mysql_source_tables)
+                    table_info.mysql_last_updated = current_time
+                    table_info.mysql_is_estimated = True  # 标记为估计值
+                    table_info.refresh_derived()
+            self._tables_version += 1
 
+            return True
 
+        except Exception as e:
+            return False
 
-    async def _update_single_schema_mysql(self, schema_name: str, tables_dict: Dict[str, TableInfo],
-                                          use_information_schema: bool = False) -> bool:
+    async def _update_single_schema_mysql(self, schema_name: str, tables_dict: Dict[str, TableInfo]) -> bool:
         """更新单个schema的MySQL记录数（异步版本，支持中断）"""
-        current_time = datetime.now()
+        current_time = time.time()
 
         # 检查是否收到停止信号
         if self.stop_event.is_set():
             return False
 
         try:
-            mysql_conn = await self.connect_mysql(schema_name)
-            if not mysql_conn:
+            pool = await self.get_mysql_pool(schema_name)
+            if not pool:
                 return False
 
-            try:
-                if use_information_schema:
-                    # 检查停止标志
-                    if self.stop_event.is_set():
-                        return False
-
-                    # 第一次运行使用information_schema快速获取估计值
-                    async with mysql_conn.cursor() as cursor:
-                        await cursor.execute("""
-                                             SELECT table_name, table_rows
-                                             FROM information_schema.tables
-                                             WHERE table_schema = %s
-                                               AND table_type = 'BASE TABLE'
-                                             ORDER BY table_rows DESC
-                                             """, (schema_name,))
-
-                        # 建立表名到行数的映射
-                        table_rows_map = {}
-                        rows = await cursor.fetchall()
-                        for row in rows:
-                            table_name, table_rows = row
-                            table_rows_map[table_name] = table_rows or 0  # 处理NULL值
-
-                    # 更新TableInfo中的MySQL行数
-                    for table_info in tables_dict.values():
-                        # 检查停止标志
-                        if self.stop_event.is_set():
-                            return False
-
-                        async with self.mysql_update_lock:
-                            if table_info.mysql_updating:
-                                continue  # 如果正在更新中，跳过
-
-                            table_info.mysql_updating = True
-                            table_info.mysql_rows = 0  # 重置
+            async with pool.acquire() as mysql_conn:
+                # 常规更新使用精确的COUNT查询 - 优化显示逻辑
+                # 首先标记所有表为更新中状态（无await点，协程间天然原子）
+                for table_info in tables_dict.values():
+                    if not table_info.mysql_updating:
+                        table_info.mysql_updating = True
 
-                            # 累加所有源表的估计行数
-                            for mysql_table_name in table_info.mysql_source_tables:
-                                if mysql_table_name in table_rows_map:
-                                    table_info.mysql_rows += table_rows_map[mysql_table_name]
+                # 把该schema所有源表的COUNT合并成UNION ALL批查询，
+                # 将每张源表一次查询往返压缩为每批一次
+                source_names = [name for table_info in tables_dict.values()
+                                for name in table_info.mysql_source_tables]
+                source_counts: Dict[str, int] = {}
 
-                            table_info.mysql_last_updated = current_time
-                            table_info.mysql_updating = False
-                            table_info.mysql_is_estimated = True  # 标记为估计值
-                else:
-                    # 常规更新使用精确的COUNT查询 - 优化显示逻辑
-                    # 首先标记所有表为更新中状态
-                    async with self.mysql_update_lock:
-                        for table_info in tables_dict.values():
-                            if not table_info.mysql_updating:
-                                table_info.mysql_updating = True
-                    
-                    # 然后逐个处理表
-                    for table_info in tables_dict.values():
+                # 整个schema的查询复用同一个游标，顺序查询无需每张表新建
+                async with mysql_conn.cursor() as cursor:
+                    for start in range(0, len(source_names), _COUNT_BATCH_SIZE):
                         # 检查停止标志
                         if self.stop_event.is_set():
                             # 恢复所有表的状态
-                            async with self.mysql_update_lock:
-                                for ti in tables_dict.values():
-                                    ti.mysql_updating = False
+                            for ti in tables_dict.values():
+                                ti.mysql_updating = False
                             return False
 
-                        # 在锁外执行查询以避免长时间锁定
-                        temp_mysql_rows = 0
-
-                        # 更新所有源表的记录数
-                        for mysql_table_name in table_info.mysql_source_tables:
-                            # 检查停止标志
-                            if self.stop_event.is_set():
-                                async with self.mysql_update_lock:
-                                    for ti in tables_dict.values():
-                                        ti.mysql_updating = False
-                                return False
-
-                            try:
-                                async with mysql_conn.cursor() as cursor:
-                                    # 先尝试使用主键索引进行count查询
-                                    try:
-                                        await cursor.execute(
-                                            f"SELECT COUNT(*) FROM `{mysql_table_name}` USE INDEX (PRIMARY)")
-                                        result = await cursor.fetchone()
-                                        mysql_rows = result[0]
-                                    except Exception:
-                                        # 如果使用索引失败（可能没有主键索引），使用普通查询
-                                        await cursor.execute(f"SELECT COUNT(*) FROM `{mysql_table_name}`")
-                                        result = await cursor.fetchone()
-                                        mysql_rows = result[0]
-                                temp_mysql_rows += mysql_rows
-                            except Exception as e:
-                                # 表可能不存在或无权限，跳过
-                                continue
-
-                        # 查询完成后更新结果
-                        async with self.mysql_update_lock:
-                            table_info.mysql_rows = temp_mysql_rows
-                            table_info.mysql_last_updated = current_time
-                            table_info.mysql_updating = False
-                            table_info.mysql_is_estimated = False  # 标记为精确值
+                        chunk = source_names[start:start + _COUNT_BATCH_SIZE]
+                        try:
+                            sql = " UNION ALL ".join(
+                                f"SELECT {i} AS k, COUNT(*) AS c FROM `{name}`"
+                                for i, name in enumerate(chunk))
+                            await cursor.execute(sql)
+                            rows = await cursor.fetchall()
+                            for k, c in rows:
+                                source_counts[chunk[k]] = c
+                        except Exception:
+                            # 批查询失败（某张表可能不存在或无权限），退回逐表查询；
+                            # InnoDB会自行选代价最低的索引做COUNT，无需USE INDEX提示
+                            for mysql_table_name in chunk:
+                                try:
+                                    await cursor.execute(f"SELECT COUNT(*) FROM `{mysql_table_name}`")
+                                    result = await cursor.fetchone()
+                                    source_counts[mysql_table_name] = result[0]
+                                except Exception as e:
+                                    # 表可能不存在或无权限，跳过
+                                    continue
+
+                # 查询完成后按目标表汇总并更新结果（写回段无await点，无需加锁）
+                for table_info in tables_dict.values():
+                    table_info.mysql_rows = sum(
+                        source_counts.get(name, 0)
+                        for name in table_info.mysql_source_tables)
+                    table_info.mysql_last_updated = current_time
+                    table_info.mysql_updating = False
+                    table_info.mysql_is_estimated = False  # 标记为精确值
+                    table_info.refresh_derived()
+                self._tables_version += 1
 
                 return True
-            finally:
-                mysql_conn.close()
 
         except Exception as e:
             # 出现异常时，标记所有表的mysql_updating为False
-            async with self.mysql_update_lock:
-                for table_info in tables_dict.values():
-                    if table_info.mysql_updating:
-                        table_info.mysql_updating = False
+            for table_info in tables_dict.values():
+                if table_info.mysql_updating:
+                    table_info.mysql_updating = False
             return False
 
     async def update_mysql_counts_async(self, target_tables: Dict[str, Dict[str, TableInfo]],
                                         use_information_schema: bool = False):
         """异步更新MySQL记录数（不阻塞主线程）"""
-        # 清理已完成的任务
-        self.mysql_update_tasks = [f for f in self.mysql_update_tasks if not f.done()]
+        # 估计值路径所有库走一次information_schema查询，单个任务即可
+        if use_information_schema:
+            task = asyncio.create_task(
+                self._update_mysql_counts_from_information_schema(target_tables))
+            self.mysql_update_tasks.add(task)
+            task.add_done_callback(self.mysql_update_tasks.discard)
+            return
 
         # 为每个schema提交异步更新任务
         for schema_name, tables_dict in target_tables.items():
             # 检查该schema是否已经有正在进行的更新任务
             schema_updating = False
-            async with self.mysql_update_lock:
-                for table_info in tables_dict.values():
-                    if table_info.mysql_updating:
-                        schema_updating = True
-                        break
+            for table_info in tables_dict.values():
+                if table_info.mysql_updating:
+                    schema_updating = True
+                    break
 
             if not schema_updating:
-                future = asyncio.create_task(
-                    self._update_single_schema_mysql(schema_name, tables_dict, use_information_schema))
-                self.mysql_update_tasks.append(future)
+                task = asyncio.create_task(
+                    self._update_single_schema_mysql(schema_name, tables_dict))
+                self.mysql_update_tasks.add(task)
+                # 任务完成后自动从集合移除，省去每轮O(n)的清理扫描
+                task.add_done_callback(self.mysql_update_tasks.discard)
 
     async def update_mysql_counts(self, target_tables: Dict[str, Dict[str, TableInfo]],
                                   use_information_schema: bool = False):
         """更新MySQL记录数（同步版本，用于兼容性）"""
-        for schema_name, tables_dict in target_tables.items():
-            await self._update_single_schema_mysql(schema_name, tables_dict, use_information_schema)
+        if use_information_schema:
+            await self._update_mysql_counts_from_information_schema(target_tables)
+            return
+        # 各库更新互相独立，并发执行
+        await asyncio.gather(*(self._update_single_schema_mysql(schema_name, tables_dict)
+                               for schema_name, tables_dict in target_tables.items()))
+
+    @staticmethod
+    async def _pg_planner_estimate(conn, schema_name: str, table_name: str) -> int:
+        """用EXPLAIN取规划器行数估计，失败返回-1"""
+        try:
+            plan_json = await conn.fetchval(
+                f'EXPLAIN (FORMAT JSON) SELECT 1 FROM "{schema_name}"."{table_name}"')
+            if isinstance(plan_json, str):
+                plan_json = json.loads(plan_json)
+            return int(plan_json[0]['Plan']['Plan Rows'])
+        except Exception:
+            return -1  # 查询失败标记为-1
 
-    async def get_postgresql_rows_from_pg_stat(self, conn, target_tables: Dict[str, Dict[str, TableInfo]]):
-        """第一次运行时使用pg_stat_user_tables快速获取PostgreSQL表行数估计值"""
-        current_time = datetime.now()
+    async def get_postgresql_rows_from_pg_stat(self, target_tables: Dict[str, Dict[str, TableInfo]]):
+        """使用pg_class.reltuples快速获取PostgreSQL表行数估计值（全部schema一次查询）"""
+        current_time = time.time()
         self.pg_updating = True
 
         try:
-            for schema_name, tables_dict in target_tables.items():
+            pool = await self.get_pg_pool()
+            if not pool:
+                return
+
+            async with pool.acquire() as conn:
                 try:
-                    # 一次性获取该schema下所有表的统计信息
+                    # 一次性获取所有监控schema下全部表的规划器行数估计
+                    # （reltuples由ANALYZE/autovacuum维护，比pg_stat计数器推算准确）
                     rows = await conn.fetch("""
-                                            SELECT relname, n_tup_ins - n_tup_del + n_tup_upd AS estimated_rows
-                                            FROM pg_stat_user_tables
-                                            WHERE schemaname = $1
-                                            """, schema_name)
-
-                    # 建立表名到估计行数的映射
+                                            SELECT n.nspname, c.relname, c.reltuples::bigint AS estimated_rows
+                                            FROM pg_class c
+                                                     JOIN pg_namespace n ON n.oid = c.relnamespace
+                                            WHERE n.nspname = ANY ($1::text[])
+                                              AND c.relkind = 'r'
+                                            """, list(target_tables.keys()))
+
+                    # 建立(schema, 表名)到估计行数的映射
                     pg_stats_map = {}
                     for row in rows:
-                        table_name, estimated_rows = row['relname'], row['estimated_rows']
-                        pg_stats_map[table_name] = max(0, estimated_rows or 0)  # 确保非负数
+                        estimated_rows = row['estimated_rows']
+                        if estimated_rows is not None and estimated_rows >= 0:
+                            pg_stats_map[(row['nspname'], row['relname'])] = estimated_rows
+                        # reltuples为-1表示从未ANALYZE过，留给下方EXPLAIN兜底
 
                     # 更新TableInfo
-                    for target_table_name, table_info in tables_dict.items():
-                        if target_table_name in pg_stats_map:
-                            new_count = pg_stats_map[target_table_name]
-                        else:
-                            # 如果统计信息中没有，可能是新表或无数据，使用精确查询
-                            try:
-                                result = await conn.fetchval(
-                                    f'SELECT COUNT(*) FROM "{schema_name}"."{target_table_name}"')
-                                new_count = result
-                            except:
-                                new_count = -1  # 查询失败标记为-1
-
-                        if not table_info.is_first_query:
-                            table_info.previous_pg_rows = table_info.pg_rows
-                        else:
-                            table_info.previous_pg_rows = new_count
-                            table_info.is_first_query = False
-
-                        table_info.pg_rows = new_count
-                        table_info.last_updated = current_time
-                        table_info.pg_is_estimated = True  # 标记为估计值
+                    for schema_name, tables_dict in target_tables.items():
+                        for target_table_name, table_info in tables_dict.items():
+                            key = (schema_name, target_table_name)
+                            if key in pg_stats_map:
+                                new_count = pg_stats_map[key]
+                            else:
+                                # 如果统计信息中没有（新表或从未ANALYZE），用EXPLAIN取规划器
+                                # 行数估计，避免大表上的精确COUNT拖慢首次刷新
+                                new_count = await self._pg_planner_estimate(conn, schema_name, target_table_name)
+
+                            if not table_info.is_first_query:
+                                table_info.previous_pg_rows = table_info.pg_rows
+                            else:
+                                table_info.previous_pg_rows = new_count
+                                table_info.is_first_query = False
+
+                            table_info.pg_rows = new_count
+                            table_info.last_updated = current_time
+                            table_info.pg_is_estimated = True  # 标记为估计值
+                            table_info.refresh_derived()
+                    self._tables_version += 1
 
                 except Exception as e:
-                    # 如果pg_stat查询失败，回退到逐表精确查询
-                    await self.update_postgresql_counts(conn, {schema_name: tables_dict})
+                    # 如果统计查询失败，回退到逐表精确查询
+                    await self.update_postgresql_counts(conn, target_tables)
         finally:
             self.pg_updating = False
 
     async def _update_single_schema_postgresql(self, schema_name: str, tables_dict: Dict[str, TableInfo]) -> bool:
         """更新单个schema的PostgreSQL记录数（异步版本，支持中断）"""
-        current_time = datetime.now()
+        current_time = time.time()
         
         # 检查是否收到停止信号
         if self.stop_event.is_set():
             return False
             
         try:
-            conn = await self.connect_postgresql()
-            if not conn:
+            pool = await self.get_pg_pool()
+            if not pool:
                 return False
 
-            try:
-                # 常规更新使用精确的COUNT查询 - 优化显示逻辑  
-                # 首先标记所有表为更新中状态
-                async with self.pg_update_lock:
-                    for table_info in tables_dict.values():
-                        if not table_info.pg_updating:
-                            table_info.pg_updating = True
-                
-                # 然后逐个处理表
-                for target_table_name, table_info in tables_dict.items():
-                    # 检查停止标志
-                    if self.stop_event.is_set():
-                        # 恢复所有表的状态
-                        async with self.pg_update_lock:
-                            for ti in tables_dict.values():
-                                ti.pg_updating = False
-                        return False
-
-                    # 在锁外执行查询以避免长时间锁定
-                    try:
-                        # 直接获取记录数
-                        new_count = await conn.fetchval(f'SELECT COUNT(*) FROM "{schema_name}"."{target_table_name}"')
-
-                        # 查询完成后更新结果
-                        async with self.pg_update_lock:
-                            if not table_info.is_first_query:
-                                table_info.previous_pg_rows = table_info.pg_rows
-                            else:
-                                table_info.previous_pg_rows = new_count
-                                table_info.is_first_query = False
+            # 首先标记所有表为更新中状态（无await点，协程间天然原子）
+            for table_info in tables_dict.values():
+                if not table_info.pg_updating:
+                    table_info.pg_updating = True
+
+            # 从连接池并发执行COUNT查询，信号量限制并发度以免占满连接池；
+            # 每批表合并为一条UNION ALL语句，把N次往返压缩为N/批大小次
+            semaphore = asyncio.Semaphore(8)
+            table_names = list(tables_dict)
+
+            async def count_chunk(chunk: List[str]):
+                if self.stop_event.is_set():
+                    for name in chunk:
+                        tables_dict[name].pg_updating = False
+                    return
+
+                counts: Dict[str, int] = {}
+                estimated: set = set()  # 超时降级为估计值的表
+                sql = " UNION ALL ".join(
+                    f'SELECT {i} AS k, COUNT(*) AS c FROM "{schema_name}"."{name}"'
+                    for i, name in enumerate(chunk))
+                try:
+                    async with semaphore:
+                        async with pool.acquire() as conn:
+                            # SET LOCAL限定超时只作用于本事务，不污染池中连接；
+                            # 整批共享一条语句，超时按批内表数放大，避免批量路径被单表级超时误杀
+                            async with conn.transaction():
+                                await conn.execute(
+                                    f"SET LOCAL statement_timeout = '{_PG_COUNT_TIMEOUT_SECS * len(chunk)}s'")
+                                rows = await conn.fetch(sql)
+                    for row in rows:
+                        counts[chunk[row['k']]] = row['c']
+                except Exception:
+                    # 批查询失败（某张表可能已删除或超时），退回逐表查询定位问题表
+                    for name in chunk:
+                        try:
+                            async with semaphore:
+                                async with pool.acquire() as conn:
+                                    try:
+                                        async with conn.transaction():
+                                            await conn.execute(
+                                                f"SET LOCAL statement_timeout = '{_PG_COUNT_TIMEOUT}'")
+                                            counts[name] = await conn.fetchval(
+                                                f'SELECT COUNT(*) FROM "{schema_name}"."{name}"')
+                                    except asyncpg.QueryCanceledError:
+                                        # 单表COUNT超时：降级为规划器估计值，保证刷新延迟有界
+                                        counts[name] = await self._pg_planner_estimate(
+                                            conn, schema_name, name)
+                                        estimated.add(name)
+                        except Exception:
+                            counts[name] = -1  # -1表示查询失败
+
+                # 查询完成后更新结果（写回段无await点，无需加锁）
+                for name in chunk:
+                    table_info = tables_dict[name]
+                    new_count = counts.get(name, -1)
 
-                            table_info.pg_rows = new_count
-                            table_info.last_updated = current_time
-                            table_info.pg_updating = False
-                            table_info.pg_is_estimated = False  # 标记为精确值
+                    if not table_info.is_first_query:
+                        table_info.previous_pg_rows = table_info.pg_rows
+                    else:
+                        table_info.previous_pg_rows = new_count
+                        table_info.is_first_query = False
 
-                    except Exception as e:
-                        # 出现异常时标记为错误状态
-                        async with self.pg_update_lock:
-                            if not table_info.is_first_query:
-                                table_info.previous_pg_rows = table_info.pg_rows
-                            else:
-                                table_info.previous_pg_rows = -1
-                                table_info.is_first_query = False
+                    table_info.pg_rows = new_count
+                    table_info.last_updated = current_time
+                    table_info.pg_updating = False
+                    # 超时降级的表标记为估计值（错误状态同样不是估计值）
+                    table_info.pg_is_estimated = name in estimated
+                    table_info.refresh_derived()
+                self._tables_version += 1
 
-                            table_info.pg_rows = -1  # -1表示查询失败
-                            table_info.last_updated = current_time
-                            table_info.pg_updating = False
-                            table_info.pg_is_estimated = False  # 错误状态不是估计值
+            await asyncio.gather(
+                *(count_chunk(table_names[start:start + _COUNT_BATCH_SIZE])
+                  for start in range(0, len(table_names), _COUNT_BATCH_SIZE)))
 
-                return True
-            finally:
-                await conn.close()
+            return True
 
         except Exception as e:
             # 出现异常时，标记所有表的pg_updating为False
-            async with self.pg_update_lock:
-                for table_info in tables_dict.values():
-                    if table_info.pg_updating:
-                        table_info.pg_updating = False
+            for table_info in tables_dict.values():
+                if table_info.pg_updating:
+                    table_info.pg_updating = False
             return False
 
     async def update_postgresql_counts_async(self, target_tables: Dict[str, Dict[str, TableInfo]]):
         """异步更新PostgreSQL记录数（不阻塞主线程）"""
-        # 清理已完成的任务
-        self.pg_update_tasks = [f for f in self.pg_update_tasks if not f.done()]
-        
         # 检查是否已经有正在进行的更新任务
         if self.pg_updating:
             return
             
-        # 为每个schema提交异步更新任务
+        # 为每个schema提交异步更新任务；
+        # 正在更新的schema由集合记录，O(1)判断代替逐表扫描pg_updating
         for schema_name, tables_dict in target_tables.items():
-            # 检查该schema是否已经有正在进行的更新任务
-            schema_updating = False
-            async with self.pg_update_lock:
-                for table_info in tables_dict.values():
-                    if table_info.pg_updating:
-                        schema_updating = True
-                        break
-            
-            if not schema_updating:
-                future = asyncio.create_task(self._update_single_schema_postgresql(schema_name, tables_dict))
-                self.pg_update_tasks.append(future)
+            if schema_name in self._pg_schemas_updating:
+                continue
+            self._pg_schemas_updating.add(schema_name)
+            future = asyncio.create_task(self._update_single_schema_postgresql(schema_name, tables_dict))
+            self.pg_update_tasks.add(future)
+            future.add_done_callback(self.pg_update_tasks.discard)
+            # 任务结束（含取消）后解除该schema的更新标记
+            future.add_done_callback(lambda _, s=schema_name: self._pg_schemas_updating.discard(s))
 
     async def update_postgresql_counts(self, conn, target_tables: Dict[str, Dict[str, TableInfo]]):
         """更新PostgreSQL记录数（同步版本，用于兼容性）"""
-        current_time = datetime.now()
+        current_time = time.time()
         self.pg_updating = True
         try:
             await self._update_postgresql_counts_exact(conn, target_tables, current_time)
@@ -1307,6 +1561,7 @@ class MonitorApp(App[None]):
                     table_info.pg_rows = new_count
                     table_info.last_updated = current_time
                     table_info.pg_is_estimated = False  # 标记为精确值
+                    table_info.refresh_derived()
 
                 except Exception as e:
                     # 出现异常时标记为错误状态，记录数设为-1表示错误
@@ -1319,6 +1574,8 @@ class MonitorApp(App[None]):
                     table_info.pg_rows = -1  # -1表示查询失败
                     table_info.last_updated = current_time
                     table_info.pg_is_estimated = False  # 错误状态不是估计值
+                    table_info.refresh_derived()
+            self._tables_version += 1
 
 
 